@@ -46,13 +46,14 @@ The resulting Excel file includes the following columns:
 ----------------------------------------------------------------------------------------
 Author: Bar Cohen
 Language: Python 3.13
-Libraries: pandas, json, os
+Libraries: openpyxl, orjson, os
 ========================================================================================
 """
 
-import json
-import pandas as pd
 import os
+import orjson  # pip install orjson
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 
 # ============= Load JSON safely =============
 def load_json_file(filename):
@@ -62,48 +63,36 @@ def load_json_file(filename):
     """
     if not os.path.exists(filename):
         raise FileNotFoundError(f"❌ File '{filename}' was not found. Please check the path.")
-    with open(filename, encoding="utf-8") as f:
-        return json.load(f)
+    with open(filename, "rb") as f:
+        return orjson.loads(f.read())
 
 # ============= Load following & followers data =============
 # After downloading data from Meta/Instagram, load both JSON files from the extracted folder.
 following_data = load_json_file("followers_and_following/following.json")
 followers_data = load_json_file("followers_and_following/followers.json")
 
-# ============= Extract Following Info =============
-# Extract username, timestamp, and profile URL from your following list.
-following = [
-    (
-        entry["string_list_data"][0]["value"],        # username
-        entry["string_list_data"][0].get("timestamp", "N/A"),  # followed at (may be missing)
-        entry["string_list_data"][0]["href"]          # profile link
-    )
-    for entry in following_data.get("relationships_following", [])
-]
-
 # ============= Extract Followers Info =============
-# followers_data is a list; extract usernames directly.
-followers = [
+# followers_data is a list; extract usernames into a set for fast membership checks.
+followers = {
     entry["string_list_data"][0]["value"]
     for entry in followers_data
-]
-
-# ============= Find who is NOT following back =============
-# Compare the lists and identify users who do not follow you back.
-not_following_back = [
-    {
-        "Username": username,
-        "Followed At": timestamp,
-        "Profile URL": f'=HYPERLINK("{url}", "{username}")'  # clickable link in Excel
-    }
-    for username, timestamp, url in following
-    if username not in followers
-]
+}
 
-# ============= Export to Excel =============
-# Create a DataFrame and export it to an Excel file.
-df = pd.DataFrame(not_following_back)
+# ============= Find who is NOT following back & export to Excel =============
+# Walk your following list once, and stream every user who does not follow you back
+# straight into a write-only workbook (no intermediate lists or DataFrame needed).
 output_file = "not_following_back_detailed.xlsx"
-df.to_excel(output_file, index=False)
+wb = Workbook(write_only=True)
+ws = wb.create_sheet("Not Following Back")
+ws.append(["Username", "Followed At", "Profile URL"])
+for entry in following_data.get("relationships_following", []):
+    sld = entry["string_list_data"][0]
+    username = sld["value"]
+    if username not in followers:
+        link = WriteOnlyCell(ws, value=username)
+        link.hyperlink = sld["href"]    # clickable link in Excel (no per-row formula)
+        link.style = "Hyperlink"        # built-in named style, shared by every link cell
+        ws.append((username, sld.get("timestamp", "N/A"), link))  # followed at may be missing
+wb.save(output_file)
 
 print(f"✅ Excel file created successfully: {output_file}")
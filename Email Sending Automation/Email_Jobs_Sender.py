@@ -3,16 +3,19 @@
 
 This Python script automates sending personalized email messages to multiple recipients
 listed in an Excel file. It connects securely to the Gmail API using OAuth 2.0 authentication
-and sends each email individually to ensure reliable delivery and avoid spam detection.
+and sends every recipient their own separate message, grouped into small, paced Gmail API batches
+to keep delivery reliable and stay within Gmail's rate limits.
 
 ---------------------------------------- Features --------------------------------------------------------
 
 - Reads recipient addresses from an Excel file named "Email List.xlsx" with a column titled "Email".
   (You must create this Excel file before running the script. Include only valid email addresses.)
 - Sends a prewritten message to each recipient via Gmail API.
-- Automatically handles Gmail authentication using credentials.json and token.pickle files.
+- Automatically handles Gmail authentication using credentials.json and token.json files.
 - Tracks failed deliveries and updates the Excel file to keep only emails that failed to send.
 - Encodes email messages in Base64, as required by Gmail API.
+- Groups the send requests into Gmail API batches (up to 50 per HTTP call) to cut network round-trips,
+  pausing between batches and retrying rate-limited sends with exponential backoff.
 - Automates repetitive outreach tasks, saving time and reducing human error.
 
 ---------------------------------- Gmail API Setup Instructions ------------------------------------------
@@ -24,11 +27,11 @@ and sends each email individually to ensure reliable delivery and avoid spam det
 5️⃣ Choose **Desktop App** and download the **credentials.json** file. (Important)
 6️⃣ Save `credentials.json` in the same folder as this script.
 7️⃣ When running the script for the first time, a browser window will open to authenticate
-   and grant access. This will automatically generate a **token.pickle** file for future runs. (The "token" must be kept)
+   and grant access. This will automatically generate a **token.json** file for future runs. (The "token" must be kept)
 
 ------------------------------------------ Important Notes -----------------------------------------------
 
-- Keep `credentials.json` and `token.pickle` secure; do not share publicly.
+- Keep `credentials.json` and `token.json` secure; do not share publicly.
 - If 2FA is enabled, use an App Password or follow Gmail OAuth instructions to allow the script to send emails.
 - Only valid email addresses in the Excel file will be processed. Empty or invalid entries are ignored.
 - The script is ideal for job applications, recruitment, or professional outreach.
@@ -36,23 +39,27 @@ and sends each email individually to ensure reliable delivery and avoid spam det
 ------------------------------------------------------------------------------------------------------------
 Author: Bar Cohen
 Language: Python 3.13
-Libraries: pandas, google-api-python-client, google-auth, google-auth-oauthlib, email, base64, pickle
+Libraries: pandas, google-api-python-client, google-auth, google-auth-oauthlib, email, base64
 ============================================================================================================
 """
 
 import pandas as pd                                     # pandas library for handling Excel files and data frames
 import base64                                           # used to encode messages for Gmail API
+import json                                             # parses the error payload of failed API requests
+import time                                             # pauses between batches and retry backoff
 from email.mime.text import MIMEText                    # for creating plain text email messages
 from googleapiclient.discovery import build             # builds the Gmail API service object
+from googleapiclient.errors import HttpError            # error type reported for failed API requests
 from google_auth_oauthlib.flow import InstalledAppFlow  # handles OAuth authentication flow
 from google.auth.transport.requests import Request      # used to refresh expired tokens
+from google.oauth2.credentials import Credentials       # used for saving/loading authentication tokens (JSON)
 import os.path                                          # file and path operations
-import pickle                                           # used for saving/loading authentication tokens
 
 # ---- 1. Read the email list from Excel ----
 try:
-    df = pd.read_excel("Email List.xlsx")               # make sure the Excel file exists and has a column named 'Email'
-    emails = df["Email"].dropna().astype(str).str.strip().tolist()  # clean up the email list
+    # all columns are read so the write-back keeps them; only 'Email' is forced to a string dtype
+    df = pd.read_excel("Email List.xlsx", dtype={"Email": "string"})  # make sure the Excel file exists and has a column named 'Email'
+    emails = list(dict.fromkeys(df["Email"].dropna().str.strip()))  # clean up and de-duplicate (order kept)
 except Exception as e:
     print(f"❌ Error reading Excel file: {e}")
     exit()
@@ -61,9 +68,8 @@ except Exception as e:
 SCOPES = ['https://www.googleapis.com/auth/gmail.send']  # permission to send emails only
 
 creds = None
-if os.path.exists('token.pickle'):                      # check if a token already exists
-    with open('token.pickle', 'rb') as token:
-        creds = pickle.load(token)                      # load the saved credentials
+if os.path.exists('token.json'):                        # check if a token already exists
+    creds = Credentials.from_authorized_user_file('token.json', SCOPES)  # load the saved credentials
 
 # if credentials are missing or invalid, perform the authentication flow
 if not creds or not creds.valid:
@@ -74,8 +80,8 @@ if not creds or not creds.valid:
         flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES) # Make sure it is indeed found, and if not, pull it from Google.
         creds = flow.run_local_server(port=0)            # opens a browser window for user authentication
     # save the token for future use
-    with open('token.pickle', 'wb') as token:
-        pickle.dump(creds, token)
+    with open('token.json', 'w') as token:
+        token.write(creds.to_json())
 
 # build the Gmail service object (by the token)
 service = build('gmail', 'v1', credentials=creds)
@@ -101,32 +107,109 @@ GitHub: https://github.com/BarCohen-dot
 """
 
 # ---- 4. Send emails safely ----
-failed_emails = []  # list to collect emails that failed to send
-
-for email in emails:  # iterate through all recipients
+BATCH_SIZE = 50         # Google advises against Gmail API batches larger than 50 sub-requests
+SEND_QUOTA_UNITS = 100  # quota units charged by Gmail API for each messages.send call
+USER_QUOTA_RATE = 250   # quota units per second Gmail API allows per user
+BATCH_PAUSE = BATCH_SIZE * SEND_QUOTA_UNITS / USER_QUOTA_RATE  # seconds between batches (20s) to stay under the per-user rate limit
+RETRY_DELAY = 1         # base delay in seconds for the exponential backoff on rate-limited sends
+MAX_RETRIES = 5         # how many times a rate-limited send is retried before it counts as failed
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}  # 403 error reasons that are worth retrying
+failed_emails = []      # list to collect emails that failed to send
+rate_limited = []       # sends of the current batch that Gmail rejected with a rate-limit error
+responded = set()       # recipients of the current batch that already got a response
+
+# create the plain text email message once; only the recipient changes between emails
+template = MIMEText(body, "plain", "utf-8")
+template['from'] = "me"                                               # "me" tells Gmail API to use the authenticated account
+template['subject'] = subject                                         # set the email subject
+template_bytes = template.as_bytes()                                  # serialized headers + body, reused for every recipient
+
+
+def is_rate_limited(exception):
+    """Return True if Gmail rejected the request because of a rate/quota limit (worth retrying)."""
+    if not isinstance(exception, HttpError):
+        return False
+    if exception.resp.status == 429:
+        return True
+    if exception.resp.status != 403:
+        return False
     try:
-        # create a plain text email message
-        message = MIMEText(body, "plain", "utf-8")
-        message['to'] = email                                         # recipient address
-        message['from'] = "me"                                        # "me" tells Gmail API to use the authenticated account
-        message['subject'] = subject                                  # set the email subject
-
-        # encode the message in Base64 as required by Gmail API
-        raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
-        message = {'raw': raw}                                        # format the message for sending
-
-        # send the email
-        sent = service.users().messages().send(userId="me", body=message).execute()
-        print(f"✅ Sent to {email} (ID: {sent['id']})")
-
-    except Exception as e:
-        print(f"❌ Failed to send to {email}: {e}")
-        failed_emails.append(email)  # add failed email to the list
+        errors = json.loads(exception.content)["error"]["errors"]
+    except (ValueError, TypeError, KeyError):
+        return False  # no structured error payload to inspect
+    return any(error.get("reason") in RATE_LIMIT_REASONS for error in errors)
+
+
+def on_response(request_id, response, exception):
+    """Batch callback: request_id is the recipient address of the sub-request."""
+    responded.add(request_id)
+    if exception is None:
+        print(f"✅ Sent to {request_id} (ID: {response['id']})")
+    elif is_rate_limited(exception):
+        rate_limited.append(request_id)  # retried after a backoff delay
+    else:
+        print(f"❌ Failed to send to {request_id}: {exception}")
+        failed_emails.append(request_id)  # add failed email to the list
+
+
+for start in range(0, len(emails), BATCH_SIZE):  # iterate through the recipients in chunks
+    if start:
+        time.sleep(BATCH_PAUSE)  # pace the batches instead of firing them back-to-back
+
+    raw_messages = {}  # recipient -> Base64 encoded message
+    for email in emails[start:start + BATCH_SIZE]:
+        try:
+            # the address is written into the raw header, so refuse anything that could break out of it
+            if "\r" in email or "\n" in email or not email.isascii():
+                raise ValueError("address contains a line break or non-ASCII characters")
+
+            # prepend the recipient header to the prebuilt message
+            raw_bytes = b"To: " + email.encode() + b"\n" + template_bytes
+
+            # encode the message in Base64 as required by Gmail API
+            raw_messages[email] = base64.urlsafe_b64encode(raw_bytes).decode()
+        except Exception as e:
+            print(f"❌ Failed to send to {email}: {e}")
+            failed_emails.append(email)
+
+    pending = list(raw_messages)
+    for attempt in range(MAX_RETRIES + 1):
+        if attempt:
+            delay = RETRY_DELAY * 2 ** attempt  # exponential backoff: 2, 4, 8, ... seconds
+            print(f"⏳ Rate limit reached, retrying {len(pending)} emails in {delay}s...")
+            time.sleep(delay)
+
+        rate_limited.clear()
+        responded.clear()
+        batch = service.new_batch_http_request(callback=on_response)
+        for email in pending:
+            # queue the email in the current batch
+            batch.add(service.users().messages().send(userId="me", body={'raw': raw_messages[email]}), request_id=email)
+
+        # send the whole batch in a single HTTP call
+        try:
+            batch.execute()
+        except Exception as e:
+            # the batch call itself failed: emails without a response were not sent
+            unsent = [email for email in pending if email not in responded]
+            if is_rate_limited(e):
+                rate_limited.extend(unsent)  # retried with the rest after a backoff delay
+            else:
+                print(f"❌ Failed to send batch of {len(unsent)} emails: {e}")
+                failed_emails.extend(unsent)
+
+        pending = list(rate_limited)
+        if not pending:
+            break
+    else:
+        for email in pending:
+            print(f"❌ Failed to send to {email}: rate limit still exceeded after {MAX_RETRIES} retries")
+        failed_emails.extend(pending)
 
 # ---- 5. Update Excel file ----
 try:
-    # keep only failed emails for review
-    remaining_df = df[df["Email"].isin(failed_emails)]
+    # keep only failed emails for review (all columns; matched on the cleaned address used for sending)
+    remaining_df = df[df["Email"].str.strip().isin(failed_emails)]
     remaining_df.to_excel("Email List.xlsx", index=False)  # overwrite the Excel file
     print("\n📄 Excel file updated: only failed emails remain.")
 except Exception as e: